@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Ahead-of-time build for the momentum kernels.
+
+Running `python kernels_build.py` compiles the hot rolling/fused kernels
+into a `momentum_kernels` extension module, so daily CLI runs import a
+prebuilt .so instead of paying Numba's JIT warm-up on every invocation.
+stockmomentum.py falls back to the @njit versions when the module is
+not built.
+"""
+
+from numba.pycc import CC
+
+cc = CC('momentum_kernels')
+
+
+@cc.export('roll_mean_2d', 'void(f4[:,::1], i8, f4[:,::1])')
+def roll_mean_2d(x, w, out):
+    """O(N) streaming rolling mean over each row of a 2-D array"""
+    for i in range(x.shape[0]):
+        s = 0.0
+        for j in range(x.shape[1]):
+            s += x[i, j]
+            if j >= w:
+                s -= x[i, j - w]
+            if j >= w - 1:
+                out[i, j - w + 1] = s / w
+
+
+@cc.export('indicators_fused', 'UniTuple(f8, 5)(f4[::1], f4[::1])')
+def indicators_fused(close, volume):
+    """Single fused pass over Close/Volume for one ticker"""
+    n = close.shape[0]
+    gain = 0.0
+    loss = 0.0
+    s20 = 0.0
+    s50 = 0.0
+    v20 = 0.0
+    v5 = 0.0
+    for j in range(n):
+        c = close[j]
+        if j >= 1:
+            d = c - close[j - 1]
+            g = d if d > 0.0 else 0.0
+            l = -d if d < 0.0 else 0.0
+            if j <= 14:
+                gain += g
+                loss += l
+                if j == 14:
+                    gain /= 14.0
+                    loss /= 14.0
+            else:
+                gain = (gain * 13.0 + g) / 14.0
+                loss = (loss * 13.0 + l) / 14.0
+        if j >= n - 5:
+            v5 += volume[j]
+        if j >= n - 20:
+            s20 += c
+            v20 += volume[j]
+        if j >= n - 50:
+            s50 += c
+    if loss > 0.0:
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    else:
+        rsi = 100.0 if gain > 0.0 else 50.0
+    sma_20 = s20 / 20.0
+    sma_50 = s50 / 50.0 if n >= 50 else sma_20
+    avg_volume_20 = v20 / 20.0
+    recent_volume = v5 / 5.0
+    return rsi, sma_20, sma_50, avg_volume_20, recent_volume
+
+
+@cc.export('rsi_wilder', 'f8(f4[::1], i8)')
+def rsi_wilder(close, n):
+    """Wilder-smoothed RSI of a close series (TradingView convention)"""
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, n + 1):
+        d = close[i] - close[i - 1]
+        gain += max(d, 0.0)
+        loss += max(-d, 0.0)
+    gain /= n
+    loss /= n
+    for i in range(n + 1, close.shape[0]):
+        d = close[i] - close[i - 1]
+        gain = (gain * (n - 1) + max(d, 0.0)) / n
+        loss = (loss * (n - 1) + max(-d, 0.0)) / n
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@cc.export('rsi_wilder_2d', 'void(f4[:,::1], i8, f4[::1])')
+def rsi_wilder_2d(close, n, out):
+    """Wilder RSI for every row of a (n_tickers, n_days) matrix"""
+    for i in range(close.shape[0]):
+        gain = 0.0
+        loss = 0.0
+        for j in range(1, n + 1):
+            d = close[i, j] - close[i, j - 1]
+            gain += max(d, 0.0)
+            loss += max(-d, 0.0)
+        gain /= n
+        loss /= n
+        for j in range(n + 1, close.shape[1]):
+            d = close[i, j] - close[i, j - 1]
+            gain = (gain * (n - 1) + max(d, 0.0)) / n
+            loss = (loss * (n - 1) + max(-d, 0.0)) / n
+        if loss == 0.0:
+            out[i] = 100.0 if gain > 0.0 else 50.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -4,20 +4,317 @@ Stock Momentum Analysis Tool
 Analyzes S&P 500 stocks and provides buy/sell recommendations based on momentum trends.
 """
 
-import yfinance as yf
-import pandas as pd
+import asyncio
+import heapq
+import io
+import multiprocessing as mp
+import os
+import sys
+import time
+from functools import lru_cache, partial
 import numpy as np
-from datetime import datetime, timedelta
+import pyarrow as pa
+import pyarrow.parquet as pq
+from numba import njit, prange
+from curl_cffi.requests import AsyncSession, Session
+from datetime import datetime, timedelta, date
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{ticker}"
+CACHE_DIR = Path("~/.cache/stockmom").expanduser()
+IMPERSONATE = "chrome110"
+
+
+def _parse_chart(payload):
+    """Parse chart-endpoint JSON straight into Close/Volume NumPy arrays"""
+    try:
+        quote = payload['chart']['result'][0]['indicators']['quote'][0]
+        # float32 has ~1e-7 relative precision, far beyond what the
+        # percentage-scale indicators need, and halves the working set
+        close = np.asarray(quote['close'], dtype=np.float32)
+        volume = np.asarray(quote['volume'], dtype=np.float32)
+    except (KeyError, IndexError, TypeError):
+        return None
+
+    valid = ~(np.isnan(close) | np.isnan(volume))
+    close = close[valid]
+    volume = volume[valid]
+    if close.size == 0:
+        return None
+    return {'Close': close, 'Volume': volume}
+
+
+def _cache_path(ticker):
+    """Path of today's cached history for a ticker"""
+    return CACHE_DIR / f"{ticker}_{date.today()}.npz"
+
+
+def _cache_read(ticker):
+    """Return today's cached Close/Volume arrays for a ticker, or None"""
+    path = _cache_path(ticker)
+    if path.exists():
+        try:
+            with np.load(path) as npz:
+                return {'Close': npz['Close'].astype(np.float32, copy=False),
+                        'Volume': npz['Volume'].astype(np.float32, copy=False)}
+        except Exception:
+            return None
+    return None
+
+
+def _cache_write(ticker, data):
+    """Persist a ticker's arrays for reuse within the day"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        np.savez(_cache_path(ticker), Close=data['Close'], Volume=data['Volume'])
+    except Exception:
+        pass
+
+
+async def _fetch_one(session, semaphore, ticker, period='6mo'):
+    """Fetch one ticker's chart JSON and parse it into arrays"""
+    cached = _cache_read(ticker)
+    if cached is not None:
+        return ticker, cached
+
+    params = {'range': period, 'interval': '1d'}
+    try:
+        async with semaphore:
+            resp = await session.get(CHART_URL.format(ticker=ticker), params=params)
+            payload = resp.json()
+    except Exception as e:
+        print(f"Error fetching data for {ticker}: {e}")
+        return ticker, None
+
+    data = _parse_chart(payload)
+    if data is None:
+        return ticker, None
+    _cache_write(ticker, data)
+    return ticker, data
+
+
+async def _fetch_tickers(tickers, period='6mo', limit=64):
+    """Fan out chart requests for a list of tickers over one session"""
+    semaphore = asyncio.Semaphore(limit)
+    async with AsyncSession(impersonate=IMPERSONATE) as session:
+        pairs = await asyncio.gather(
+            *[_fetch_one(session, semaphore, t, period) for t in tickers]
+        )
+    return {ticker: data for ticker, data in pairs if data is not None}
+
+
+def _results_path():
+    """Path of today's persisted analysis results"""
+    return CACHE_DIR / f"results-{date.today()}.parquet"
+
+
+def _load_results(path):
+    """Load persisted results if the file is less than a day old"""
+    try:
+        if path.exists() and time.time() - path.stat().st_mtime < 86400:
+            return pq.read_table(path).to_pylist()
+    except Exception:
+        return None
+    return None
+
+
+def _save_results(results, path):
+    """Persist the full results list as one parquet table"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        rows = [
+            {k: (v.item() if isinstance(v, np.generic) else v) for k, v in r.items()}
+            for r in results
+        ]
+        pq.write_table(pa.Table.from_pylist(rows), path)
+    except Exception:
+        pass
+
+
+# In-process memo of successful single-ticker fetches. Only successes
+# are stored, so a transient network failure is retried on the next
+# call instead of being cached for the process lifetime. Entries are
+# dicts of arrays shared between callers — treat them as read-only.
+_fetch_memo = {}
+
+
+def _fetch_sync(ticker, period='6mo'):
+    """Fetch one ticker synchronously, memoized on success"""
+    key = (ticker, period)
+    memoized = _fetch_memo.get(key)
+    if memoized is not None:
+        return memoized
+
+    cached = _cache_read(ticker)
+    if cached is not None:
+        _fetch_memo[key] = cached
+        return cached
+    try:
+        with Session(impersonate=IMPERSONATE) as session:
+            resp = session.get(
+                CHART_URL.format(ticker=ticker),
+                params={'range': period, 'interval': '1d'}
+            )
+            payload = resp.json()
+    except Exception as e:
+        print(f"Error fetching data for {ticker}: {e}")
+        return None
+
+    data = _parse_chart(payload)
+    if data is not None:
+        _cache_write(ticker, data)
+        _fetch_memo[key] = data
+    return data
+
+
+def _fetch_chunk(tickers, period='6mo'):
+    """Fetch one chunk of tickers; runs inside a pool worker process"""
+    return asyncio.run(_fetch_tickers(tickers, period, limit=16))
+
+
+def _chunks(seq, size):
+    """Split a sequence into consecutive chunks of at most `size`"""
+    for i in range(0, len(seq), size):
+        yield seq[i:i + size]
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def roll_mean_2d(x, w, out):
+    """O(N) streaming rolling mean over each row of a 2-D array
+
+    Maintains a running window sum (one add, one subtract per step)
+    instead of re-reducing each window, with rows processed in parallel.
+    """
+    for i in prange(x.shape[0]):
+        s = 0.0
+        for j in range(x.shape[1]):
+            s += x[i, j]
+            if j >= w:
+                s -= x[i, j - w]
+            if j >= w - 1:
+                out[i, j - w + 1] = s / w
+
+
+def _roll_mean(x, w, out=None):
+    """Rolling mean of each row of x over window w"""
+    if out is None:
+        out = np.empty((x.shape[0], x.shape[1] - w + 1), dtype=x.dtype)
+    roll_mean_2d(x, w, out)
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def indicators_fused(close, volume):
+    """Single fused pass over Close/Volume for one ticker
+
+    Accumulates the Wilder-smoothed RSI averages, SMA20/SMA50 and
+    5/20-day volume window sums in one walk of the arrays, so the price
+    column is read from memory once instead of once per indicator.
+    """
+    n = close.shape[0]
+    gain = 0.0
+    loss = 0.0
+    s20 = 0.0
+    s50 = 0.0
+    v20 = 0.0
+    v5 = 0.0
+    for j in range(n):
+        c = close[j]
+        if j >= 1:
+            d = c - close[j - 1]
+            g = d if d > 0.0 else 0.0
+            l = -d if d < 0.0 else 0.0
+            # Wilder RSI: simple mean over the first 14 deltas, then
+            # exponential smoothing with alpha = 1/14
+            if j <= 14:
+                gain += g
+                loss += l
+                if j == 14:
+                    gain /= 14.0
+                    loss /= 14.0
+            else:
+                gain = (gain * 13.0 + g) / 14.0
+                loss = (loss * 13.0 + l) / 14.0
+        if j >= n - 5:
+            v5 += volume[j]
+        if j >= n - 20:
+            s20 += c
+            v20 += volume[j]
+        if j >= n - 50:
+            s50 += c
+    if loss > 0.0:
+        rsi = 100.0 - 100.0 / (1.0 + gain / loss)
+    else:
+        rsi = 100.0 if gain > 0.0 else 50.0
+    sma_20 = s20 / 20.0
+    sma_50 = s50 / 50.0 if n >= 50 else sma_20
+    avg_volume_20 = v20 / 20.0
+    recent_volume = v5 / 5.0
+    return rsi, sma_20, sma_50, avg_volume_20, recent_volume
+
+
+@njit(cache=True, fastmath=True)
+def rsi_wilder(close, n=14):
+    """Wilder-smoothed RSI of a close series (TradingView convention)"""
+    gain = 0.0
+    loss = 0.0
+    for i in range(1, n + 1):
+        d = close[i] - close[i - 1]
+        gain += max(d, 0.0)
+        loss += max(-d, 0.0)
+    gain /= n
+    loss /= n
+    for i in range(n + 1, close.shape[0]):
+        d = close[i] - close[i - 1]
+        gain = (gain * (n - 1) + max(d, 0.0)) / n
+        loss = (loss * (n - 1) + max(-d, 0.0)) / n
+    if loss == 0.0:
+        return 100.0 if gain > 0.0 else 50.0
+    return 100.0 - 100.0 / (1.0 + gain / loss)
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def rsi_wilder_2d(close, n, out):
+    """Wilder RSI for every row of a (n_tickers, n_days) matrix"""
+    for i in prange(close.shape[0]):
+        out[i] = rsi_wilder(close[i], n)
+
+
+# Prefer the AOT-compiled kernels when kernels_build.py has been run;
+# otherwise keep the @njit versions and pay the JIT warm-up once.
+try:
+    from momentum_kernels import (  # noqa: F811
+        roll_mean_2d, indicators_fused, rsi_wilder, rsi_wilder_2d
+    )
+except ImportError:
+    pass
+
 class StockMomentumAnalyzer:
-    def __init__(self):
-        self.sp500_tickers = self._get_sp500_tickers()
+    def __init__(self, limit=100):
+        self.sp500_tickers = self._get_sp500_tickers(limit)
         self.data = {}
-        
-    def _get_sp500_tickers(self):
-        """Get S&P 500 ticker symbols"""
+        # Reusable kernel output buffers, keyed by name; allocated on
+        # first use and rewritten in place on subsequent runs
+        self._scratch = {}
+
+    def _scratch_buf(self, key, shape, dtype):
+        """Return a preallocated buffer, reallocating only on shape change"""
+        buf = self._scratch.get(key)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._scratch[key] = buf
+        return buf
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _get_sp500_tickers(limit=None):
+        """Get S&P 500 ticker symbols, deduplicated and optionally truncated
+
+        Static and memoized so the literal below is only materialized
+        once per process, however many analyzers are constructed.
+        """
         # Using a subset of major S&P 500 stocks for demonstration
         # In production, you'd fetch the complete list from a reliable source
         major_stocks = [
@@ -77,57 +374,67 @@ class StockMomentumAnalyzer:
             'WM', 'WMB', 'WMT', 'WRB', 'WY', 'WYNN', 'XEL', 'XLNX', 'XOM',
             'XRAY', 'XYL', 'YUM', 'ZBH', 'ZBRA', 'ZION', 'ZTS'
         ]
-        return major_stocks[:100]  # Using first 100 for performance
+        # The literal above contains repeated symbols; dict.fromkeys drops
+        # the duplicates while preserving order, so no ticker is fetched twice
+        unique_stocks = tuple(dict.fromkeys(major_stocks))
+        return unique_stocks[:limit] if limit else unique_stocks
     
     def fetch_stock_data(self, ticker, period='6mo'):
-        """Fetch stock data for a given ticker"""
+        """Fetch one ticker's Close/Volume arrays from the chart endpoint"""
+        return _fetch_sync(ticker, period)
+
+    def fetch_all_stock_data(self, period='6mo'):
+        """Fetch data for all tickers concurrently via the chart endpoint
+
+        Large ticker sets are split into chunks dispatched to a process
+        pool, so the CPU-bound JSON decode and array parsing scale across
+        cores; each worker runs its own async fan-out for its chunk.
+        """
+        tickers = list(self.sp500_tickers)
         try:
-            stock = yf.Ticker(ticker)
-            data = stock.history(period=period)
-            if data.empty:
-                return None
-            return data
+            if len(tickers) > 100:
+                chunks = list(_chunks(tickers, 12))
+                with mp.Pool(os.cpu_count()) as pool:
+                    chunk_maps = pool.map(partial(_fetch_chunk, period=period), chunks)
+                all_data = {}
+                for chunk_map in chunk_maps:
+                    all_data.update(chunk_map)
+                return all_data
+            return asyncio.run(_fetch_tickers(tickers, period))
         except Exception as e:
-            print(f"Error fetching data for {ticker}: {e}")
-            return None
+            print(f"Error downloading batch data: {e}")
+            return {}
     
     def calculate_momentum_indicators(self, data, ticker):
         """Calculate various momentum indicators"""
-        if data is None or len(data) < 20:
+        if data is None or len(data['Close']) < 20:
             return None
-            
+
+        close = np.asarray(data['Close'], dtype=np.float32)
+        volume = np.asarray(data['Volume'], dtype=np.float32)
+
         # Price change over different periods
-        price_1w = data['Close'].iloc[-5] if len(data) >= 5 else data['Close'].iloc[0]
-        price_1m = data['Close'].iloc[-20] if len(data) >= 20 else data['Close'].iloc[0]
-        price_3m = data['Close'].iloc[-60] if len(data) >= 60 else data['Close'].iloc[0]
-        
-        current_price = data['Close'].iloc[-1]
-        
+        price_1w = close[-5] if len(close) >= 5 else close[0]
+        price_1m = close[-20] if len(close) >= 20 else close[0]
+        price_3m = close[-60] if len(close) >= 60 else close[0]
+
+        current_price = close[-1]
+
         # Calculate returns
         returns_1w = (current_price - price_1w) / price_1w * 100
         returns_1m = (current_price - price_1m) / price_1m * 100
         returns_3m = (current_price - price_3m) / price_3m * 100
-        
-        # RSI calculation
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        current_rsi = rsi.iloc[-1] if not rsi.empty else 50
-        
-        # Moving averages
-        sma_20 = data['Close'].rolling(window=20).mean().iloc[-1]
-        sma_50 = data['Close'].rolling(window=50).mean().iloc[-1] if len(data) >= 50 else sma_20
-        
-        # Volume trend
-        avg_volume_20 = data['Volume'].rolling(window=20).mean().iloc[-1]
-        recent_volume = data['Volume'].iloc[-5:].mean()
+
+        # RSI, moving averages and volume windows in one fused pass
+        current_rsi, sma_20, sma_50, avg_volume_20, recent_volume = indicators_fused(close, volume)
         volume_ratio = recent_volume / avg_volume_20 if avg_volume_20 > 0 else 1
-        
-        # Volatility (20-day rolling standard deviation)
-        volatility = data['Close'].pct_change().rolling(window=20).std().iloc[-1] * 100
-        
+
+        # Volatility (std of the last 20 daily returns); needs 21 closes
+        if len(close) >= 21:
+            volatility = (close[-20:] / close[-21:-1] - 1).std(ddof=1) * 100
+        else:
+            volatility = np.nan
+
         return {
             'ticker': ticker,
             'current_price': current_price,
@@ -143,135 +450,227 @@ class StockMomentumAnalyzer:
             'price_vs_sma50': (current_price - sma_50) / sma_50 * 100 if sma_50 > 0 else 0
         }
     
+    def _compute_all(self, all_data):
+        """Calculate momentum indicators for all tickers at once
+
+        Tickers are bucketed by history length so each bucket stacks into
+        one dense (n_tickers, n_days) matrix without truncating longer
+        histories to the shortest one; each bucket is computed with
+        vectorized NumPy reductions and the per-ticker arrays are
+        concatenated. Chart histories almost always share one length, so
+        there is normally a single bucket.
+        """
+        by_length = {}
+        for ticker, data in all_data.items():
+            n_days = len(data['Close'])
+            if n_days >= 20:
+                by_length.setdefault(n_days, []).append(ticker)
+        if not by_length:
+            return None
+
+        groups = [
+            self._compute_group(tickers, all_data, n_days)
+            for n_days, tickers in by_length.items()
+        ]
+        if len(groups) == 1:
+            return groups[0]
+        return {k: np.concatenate([g[k] for g in groups]) for k in groups[0]}
+
+    def _compute_group(self, tickers, all_data, n_days):
+        """Indicators for one bucket of equal-length histories"""
+        close = np.stack([np.asarray(all_data[t]['Close']) for t in tickers])
+        volume = np.stack([np.asarray(all_data[t]['Volume']) for t in tickers])
+
+        current_price = close[:, -1]
+
+        # Price change over different periods
+        price_1w = close[:, -5] if n_days >= 5 else close[:, 0]
+        price_1m = close[:, -20] if n_days >= 20 else close[:, 0]
+        price_3m = close[:, -60] if n_days >= 60 else close[:, 0]
+
+        returns_1w = (current_price - price_1w) / price_1w * 100
+        returns_1m = (current_price - price_1m) / price_1m * 100
+        returns_3m = (current_price - price_3m) / price_3m * 100
+
+        n_tickers = close.shape[0]
+
+        # Wilder-smoothed 14-day RSI, one row per ticker
+        rsi = self._scratch_buf(('rsi', n_days), (n_tickers,), close.dtype)
+        rsi_wilder_2d(close, 14, rsi)
+
+        # Moving averages
+        out20 = self._scratch_buf(('sma20', n_days), (n_tickers, n_days - 19), close.dtype)
+        sma_20 = _roll_mean(close, 20, out20)[:, -1]
+        if n_days >= 50:
+            out50 = self._scratch_buf(('sma50', n_days), (n_tickers, n_days - 49), close.dtype)
+            sma_50 = _roll_mean(close, 50, out50)[:, -1]
+        else:
+            sma_50 = sma_20
+
+        # Volume trend
+        vol20 = self._scratch_buf(('vol20', n_days), (n_tickers, n_days - 19), volume.dtype)
+        avg_volume_20 = _roll_mean(volume, 20, vol20)[:, -1]
+        recent_volume = volume[:, -5:].mean(axis=1)
+        volume_ratio = np.where(avg_volume_20 > 0, recent_volume / avg_volume_20, 1.0)
+
+        # Volatility (std of the last 20 daily returns); needs 21 closes
+        if n_days >= 21:
+            volatility = (close[:, -20:] / close[:, -21:-1] - 1).std(axis=1, ddof=1) * 100
+        else:
+            volatility = np.full(n_tickers, np.nan, dtype=close.dtype)
+
+        return {
+            'ticker': np.array(tickers),
+            'current_price': current_price,
+            'returns_1w': returns_1w,
+            'returns_1m': returns_1m,
+            'returns_3m': returns_3m,
+            'rsi': rsi,
+            'sma_20': sma_20,
+            'sma_50': sma_50,
+            'volume_ratio': volume_ratio,
+            'volatility': volatility,
+            'price_vs_sma20': (current_price - sma_20) / sma_20 * 100,
+            'price_vs_sma50': np.where(sma_50 > 0, (current_price - sma_50) / sma_50 * 100, 0.0)
+        }
+
     def calculate_momentum_score(self, indicators):
-        """Calculate a composite momentum score"""
+        """Calculate composite momentum scores as one vectorized expression
+
+        Works elementwise, so it accepts either the struct-of-arrays dict
+        from _compute_all (returning an array of scores) or a single
+        ticker's scalar dict.
+        """
         if not indicators:
             return 0
-            
-        score = 0
-        
-        # Short-term momentum (40% weight)
-        if indicators['returns_1w'] > 0:
-            score += min(indicators['returns_1w'] * 2, 20)  # Cap at 20 points
-        else:
-            score += max(indicators['returns_1w'] * 2, -20)  # Cap at -20 points
-        
-        # Medium-term momentum (30% weight)
-        if indicators['returns_1m'] > 0:
-            score += min(indicators['returns_1m'] * 1.5, 15)
-        else:
-            score += max(indicators['returns_1m'] * 1.5, -15)
-        
-        # Long-term momentum (20% weight)
-        if indicators['returns_3m'] > 0:
-            score += min(indicators['returns_3m'], 10)
-        else:
-            score += max(indicators['returns_3m'], -10)
-        
-        # RSI momentum (10% weight)
-        if 30 <= indicators['rsi'] <= 70:  # Not overbought/oversold
-            score += 5
-        elif indicators['rsi'] > 80:  # Overbought
-            score -= 10
-        elif indicators['rsi'] < 20:  # Oversold
-            score += 10
-        
-        # Volume confirmation
-        if indicators['volume_ratio'] > 1.2:  # Above average volume
-            score += 5
-        elif indicators['volume_ratio'] < 0.8:  # Below average volume
-            score -= 5
-        
-        # Price vs moving averages
-        if indicators['price_vs_sma20'] > 0:
-            score += 3
-        if indicators['price_vs_sma50'] > 0:
-            score += 2
-        
-        return score
+
+        rsi = indicators['rsi']
+        volume_ratio = indicators['volume_ratio']
+
+        return (
+            # Short/medium/long-term momentum, capped at 20/15/10 points
+            np.clip(indicators['returns_1w'] * 2, -20, 20)
+            + np.clip(indicators['returns_1m'] * 1.5, -15, 15)
+            + np.clip(indicators['returns_3m'], -10, 10)
+            # RSI: neutral zone rewarded, overbought punished, oversold rewarded
+            + np.where((rsi >= 30) & (rsi <= 70), 5,
+                       np.where(rsi > 80, -10,
+                                np.where(rsi < 20, 10, 0)))
+            # Volume confirmation
+            + np.where(volume_ratio > 1.2, 5,
+                       np.where(volume_ratio < 0.8, -5, 0))
+            # Price vs moving averages
+            + np.where(indicators['price_vs_sma20'] > 0, 3, 0)
+            + np.where(indicators['price_vs_sma50'] > 0, 2, 0)
+        )
     
     def analyze_stocks(self):
         """Analyze all S&P 500 stocks and return recommendations"""
         print("Fetching stock data and calculating momentum indicators...")
         
-        results = []
-        
-        for i, ticker in enumerate(self.sp500_tickers):
-            if i % 20 == 0:
-                print(f"Processing {i+1}/{len(self.sp500_tickers)} stocks...")
-            
-            data = self.fetch_stock_data(ticker)
-            if data is not None:
-                indicators = self.calculate_momentum_indicators(data, ticker)
-                if indicators:
-                    indicators['momentum_score'] = self.calculate_momentum_score(indicators)
-                    results.append(indicators)
-        
+        all_data = self.fetch_all_stock_data()
+        arrays = self._compute_all(all_data)
+        if arrays is None:
+            return []
+
+        arrays['momentum_score'] = self.calculate_momentum_score(arrays)
+        # Keep the struct-of-arrays around so get_recommendations can
+        # select top/bottom picks with vectorized masks
+        self._arrays = arrays
+
+        keys = list(arrays.keys())
+        results = [
+            {k: arrays[k][i] for k in keys}
+            for i in range(len(arrays['ticker']))
+        ]
+
         return results
     
     def get_recommendations(self, results, top_n=5):
         """Get top buy and sell recommendations"""
         if not results:
             return [], []
-        
-        # Filter out stocks with extreme volatility or very low prices
+
+        arrays = getattr(self, '_arrays', None)
+        if arrays is not None and len(arrays['ticker']) == len(results):
+            return self._recommend_from_arrays(arrays, results, top_n)
+
+        # Fallback for result lists built outside analyze_stocks
         filtered_results = [
-            r for r in results 
+            r for r in results
             if r['volatility'] < 50 and r['current_price'] > 5
         ]
-        
-        # Sort by momentum score
-        sorted_results = sorted(filtered_results, key=lambda x: x['momentum_score'], reverse=True)
-        
-        # Top buys (highest momentum scores)
-        top_buys = sorted_results[:top_n]
-        
-        # Top sells (lowest momentum scores)
-        top_sells = sorted_results[-top_n:]
-        
+
+        top_buys = heapq.nlargest(top_n, filtered_results, key=lambda x: x['momentum_score'])
+        top_sells = heapq.nsmallest(top_n, filtered_results, key=lambda x: x['momentum_score'])
+        top_sells.reverse()
+
+        return top_buys, top_sells
+
+    def _recommend_from_arrays(self, arrays, results, top_n):
+        """Select top/bottom picks with one vectorized pass over the scores"""
+        score = np.asarray(arrays['momentum_score'], dtype=np.float64)
+
+        # Filter out stocks with extreme volatility or very low prices
+        mask = (arrays['volatility'] < 50) & (arrays['current_price'] > 5)
+        top_n = min(top_n, int(mask.sum()))
+        if top_n == 0:
+            return [], []
+
+        buy_key = np.where(mask, score, -np.inf)
+        buy_idx = np.argpartition(buy_key, -top_n)[-top_n:]
+        buy_idx = buy_idx[np.argsort(buy_key[buy_idx])[::-1]]
+
+        sell_key = np.where(mask, score, np.inf)
+        sell_idx = np.argpartition(sell_key, top_n - 1)[:top_n]
+        sell_idx = sell_idx[np.argsort(sell_key[sell_idx])[::-1]]
+
+        top_buys = [results[i] for i in buy_idx]
+        top_sells = [results[i] for i in sell_idx]
         return top_buys, top_sells
     
+    @staticmethod
+    def _format_stock(i, stock):
+        """Format one recommendation entry"""
+        return (
+            f"{i}. {stock['ticker']}\n"
+            f"   Price: ${stock['current_price']:.2f}\n"
+            f"   Momentum Score: {stock['momentum_score']:.1f}\n"
+            f"   1W Return: {stock['returns_1w']:.1f}%\n"
+            f"   1M Return: {stock['returns_1m']:.1f}%\n"
+            f"   3M Return: {stock['returns_3m']:.1f}%\n"
+            f"   RSI: {stock['rsi']:.1f}\n"
+            f"   Volume Ratio: {stock['volume_ratio']:.1f}x\n"
+        )
+
     def print_recommendations(self, top_buys, top_sells):
-        """Print formatted recommendations"""
-        print("\n" + "="*80)
-        print("STOCK MOMENTUM ANALYSIS - RECOMMENDATIONS")
-        print("="*80)
-        print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Data Period: Last 6 months")
-        print(f"Stocks Analyzed: {len(self.sp500_tickers)}")
-        
-        print("\n" + "🔥 TOP 5 BUY RECOMMENDATIONS" + "🔥")
-        print("-" * 50)
+        """Print formatted recommendations in a single stdout write"""
+        buf = io.StringIO()
+        buf.write("\n" + "="*80 + "\n")
+        buf.write("STOCK MOMENTUM ANALYSIS - RECOMMENDATIONS\n")
+        buf.write("="*80 + "\n")
+        buf.write(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        buf.write("Data Period: Last 6 months\n")
+        buf.write(f"Stocks Analyzed: {len(self.sp500_tickers)}\n")
+
+        buf.write("\n" + "🔥 TOP 5 BUY RECOMMENDATIONS" + "🔥\n")
+        buf.write("-" * 50 + "\n")
         for i, stock in enumerate(top_buys, 1):
-            print(f"{i}. {stock['ticker']}")
-            print(f"   Price: ${stock['current_price']:.2f}")
-            print(f"   Momentum Score: {stock['momentum_score']:.1f}")
-            print(f"   1W Return: {stock['returns_1w']:.1f}%")
-            print(f"   1M Return: {stock['returns_1m']:.1f}%")
-            print(f"   3M Return: {stock['returns_3m']:.1f}%")
-            print(f"   RSI: {stock['rsi']:.1f}")
-            print(f"   Volume Ratio: {stock['volume_ratio']:.1f}x")
-            print()
-        
-        print("\n" + "❌ TOP 5 SELL RECOMMENDATIONS" + "❌")
-        print("-" * 50)
+            buf.write(self._format_stock(i, stock) + "\n")
+
+        buf.write("\n" + "❌ TOP 5 SELL RECOMMENDATIONS" + "❌\n")
+        buf.write("-" * 50 + "\n")
         for i, stock in enumerate(top_sells, 1):
-            print(f"{i}. {stock['ticker']}")
-            print(f"   Price: ${stock['current_price']:.2f}")
-            print(f"   Momentum Score: {stock['momentum_score']:.1f}")
-            print(f"   1W Return: {stock['returns_1w']:.1f}%")
-            print(f"   1M Return: {stock['returns_1m']:.1f}%")
-            print(f"   3M Return: {stock['returns_3m']:.1f}%")
-            print(f"   RSI: {stock['rsi']:.1f}")
-            print(f"   Volume Ratio: {stock['volume_ratio']:.1f}x")
-            print()
-        
-        print("\n" + "⚠️  DISCLAIMER" + "⚠️")
-        print("-" * 30)
-        print("This analysis is for educational purposes only.")
-        print("Past performance does not guarantee future results.")
-        print("Always do your own research before making investment decisions.")
-        print("Consider consulting with a financial advisor.")
+            buf.write(self._format_stock(i, stock) + "\n")
+
+        buf.write("\n" + "⚠️  DISCLAIMER" + "⚠️\n")
+        buf.write("-" * 30 + "\n")
+        buf.write("This analysis is for educational purposes only.\n")
+        buf.write("Past performance does not guarantee future results.\n")
+        buf.write("Always do your own research before making investment decisions.\n")
+        buf.write("Consider consulting with a financial advisor.\n")
+
+        sys.stdout.write(buf.getvalue())
 
 def main():
     """Main function to run the stock momentum analysis"""
@@ -279,12 +678,20 @@ def main():
     print("Fetching S&P 500 data and analyzing momentum trends...")
     
     analyzer = StockMomentumAnalyzer()
-    results = analyzer.analyze_stocks()
-    
+
+    # Reuse today's persisted results when fresh; otherwise run the
+    # full analysis and persist it for the next invocation
+    results_path = _results_path()
+    results = _load_results(results_path)
+    if results is None:
+        results = analyzer.analyze_stocks()
+        if results:
+            _save_results(results, results_path)
+
     if not results:
         print("No data available for analysis.")
         return
-    
+
     top_buys, top_sells = analyzer.get_recommendations(results)
     analyzer.print_recommendations(top_buys, top_sells)
 